@@ -1,40 +1,113 @@
 # Dashboard.py
 import os
+import re
+import atexit
 import sys
+import copy
 import json
-import shlex
-import subprocess
+import functools
+import itertools
+from collections import deque
 from pathlib import Path
-from datetime import datetime
-from typing import Any
+from typing import Any, Callable, Iterator, TextIO
 
 CONFIG_FILE = "dashboard_config.json"
 STATE_FILE = "dashboard_state.json"
+INDEX_FILE = ".dashboard_index.json"
+# Archivos de exclusión que se leen en la raíz de cada unidad (mismo formato que .gitignore).
+# .dashboardignore va al final: la última regla que coincide gana, así que puede
+# re-incluir (con "!") lo que .gitignore excluye.
+IGNORE_FILES = (".gitignore", ".dashboardignore")
+
+# Carpeta del dashboard (se resuelve una sola vez)
+_SCRIPT_DIR = Path(__file__).resolve().parent
 
 
 # ----------------------------
 # Utilidades
 # ----------------------------
+# None = aún no se comprobó si la consola acepta secuencias ANSI
+_ANSI_OK: bool | None = None
+
+
+def _enable_ansi() -> bool:
+    """
+    En Windows 10+ activa el modo VT de la consola (una sola vez); en Unix no hace falta.
+    """
+    if os.name != "nt":
+        return True
+    try:
+        import ctypes
+        kernel32 = ctypes.windll.kernel32  # type: ignore[attr-defined]
+        handle = kernel32.GetStdHandle(-11)  # STD_OUTPUT_HANDLE
+        mode = ctypes.c_ulong()
+        if not kernel32.GetConsoleMode(handle, ctypes.byref(mode)):
+            return False
+        # ENABLE_VIRTUAL_TERMINAL_PROCESSING
+        return bool(kernel32.SetConsoleMode(handle, mode.value | 0x0004))
+    except Exception:
+        return False
+
+
 def clear_screen():
-    os.system("cls" if os.name == "nt" else "clear")
+    global _ANSI_OK
+    if _ANSI_OK is None:
+        _ANSI_OK = _enable_ansi()
+    if _ANSI_OK:
+        # Escribir la secuencia evita lanzar un shell (cls/clear) en cada redibujo
+        sys.stdout.write("\x1b[2J\x1b[H")
+        sys.stdout.flush()
+    else:
+        # Consolas de Windows antiguas sin soporte VT
+        os.system("cls" if os.name == "nt" else "clear")
 
 
 def pause(msg="\nPresiona Enter para continuar..."):
     input(msg)
 
 
+# (día ordinal, "YYYY-MM-DD "): la fecha sólo se formatea una vez por día
+_DATE_PREFIX: tuple[int, str] | None = None
+
+
 def now_str():
-    return datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    global _DATE_PREFIX
+    from datetime import datetime
+    now = datetime.now()
+    day = now.toordinal()
+    if _DATE_PREFIX is None or _DATE_PREFIX[0] != day:
+        _DATE_PREFIX = (day, now.strftime("%Y-%m-%d "))
+    return f"{_DATE_PREFIX[1]}{now.hour:02d}:{now.minute:02d}:{now.second:02d}"
 
 
-def safe_read_text(path: Path) -> str:
-    return path.read_text(encoding="utf-8", errors="replace")
+def safe_open_text(path: Path) -> TextIO:
+    return path.open("r", encoding="utf-8", errors="replace")
 
 
 def is_python_file(p: Path) -> bool:
     return p.is_file() and p.suffix.lower() == ".py" and not p.name.startswith("__")
 
 
+def _fast_split(s: str) -> list[str]:
+    """
+    Divide argumentos como shlex.split, pero sin crear un lexer cuando no hay comillas
+    ni barras invertidas (el caso típico, ej: "code -n"): ahí str.split() da lo mismo.
+    """
+    if '"' not in s and "'" not in s and "\\" not in s:
+        return s.split()
+    import shlex
+    return shlex.split(s)
+
+
+@functools.lru_cache(maxsize=2048)
+def _canon(path_str: str) -> str:
+    """
+    Ruta canónica (resolve) memoizada: los scripts cuelgan de base_dir, que ya se
+    resolvió al cargar la config, así que el resultado no cambia durante la sesión.
+    """
+    return str(Path(path_str).resolve())
+
+
 def relpath_str(path: Path, base: Path) -> str:
     try:
         return str(path.resolve().relative_to(base.resolve()))
@@ -67,25 +140,72 @@ def default_config(base_dir: Path) -> dict:
         "recent_limit": 15,
         "favorites_enabled": True,
         "ask_args_before_run": True,
-        "open_unit_folder_shortcut": True
+        "open_unit_folder_shortcut": True,
+        "inproc_run": False  # ejecuta en el mismo intérprete (más rápido, sin aislamiento)
     }
 
 
+# Cache de la config parseada: (mtime del archivo, dict).
+_CONFIG_CACHE: tuple[float, dict] | None = None
+
+
+def write_json_atomic(path: Path, data: dict) -> float | None:
+    """
+    Escribe JSON en un .tmp y lo reemplaza de forma atómica sobre el destino.
+    Devuelve el nuevo mtime (o None si no se pudo escribir).
+    """
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    try:
+        # json.dump escribe directo al archivo, sin armar antes todo el texto en memoria
+        with tmp.open("w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+        os.replace(tmp, path)
+        return path.stat().st_mtime
+    except Exception:
+        try:
+            tmp.unlink()
+        except OSError:
+            pass
+        return None
+
+
+def save_config(cfg: dict) -> float | None:
+    """
+    Guarda la config sin las claves internas (las que empiezan por "_", calculadas al cargar).
+    """
+    data = {k: v for k, v in cfg.items() if not k.startswith("_")}
+    return write_json_atomic(_SCRIPT_DIR / CONFIG_FILE, data)
+
+
+def _cache_config(mtime: float | None, cfg: dict) -> dict:
+    global _CONFIG_CACHE
+    # Invariante de los menús: las unidades ordenadas se calculan una vez por carga
+    cfg["_units_sorted"] = tuple(sorted(cfg.get("units", {}).keys()))
+    _CONFIG_CACHE = (mtime, copy.deepcopy(cfg)) if mtime is not None else None
+    return cfg
+
+
 def load_or_create_config() -> dict:
-    script_dir = Path(__file__).resolve().parent
+    script_dir = _SCRIPT_DIR
     config_path = script_dir / CONFIG_FILE
 
     if not config_path.exists():
         cfg = default_config(script_dir)
-        config_path.write_text(json.dumps(cfg, indent=2, ensure_ascii=False), encoding="utf-8")
-        return cfg
+        return _cache_config(save_config(cfg), cfg)
+
+    # Si el archivo no cambió desde la última lectura, reutiliza la config ya migrada
+    try:
+        mtime = config_path.stat().st_mtime
+    except OSError:
+        mtime = None
+    if _CONFIG_CACHE is not None and _CONFIG_CACHE[0] == mtime:
+        return copy.deepcopy(_CONFIG_CACHE[1])
 
     try:
         cfg = json.loads(config_path.read_text(encoding="utf-8"))
     except Exception:
         cfg = default_config(script_dir)
-        config_path.write_text(json.dumps(cfg, indent=2, ensure_ascii=False), encoding="utf-8")
-        return cfg
+        return _cache_config(save_config(cfg), cfg)
 
     # Normaliza base_dir a absoluto
     if "base_dir" in cfg:
@@ -93,90 +213,148 @@ def load_or_create_config() -> dict:
 
     # Migra claves faltantes (sin romper configs viejas)
     defaults = default_config(Path(cfg.get("base_dir", script_dir)))
+    migrated = False
     for k, v in defaults.items():
-        cfg.setdefault(k, v)
-
-    # Guarda si hubo migración
-    try:
-        config_path.write_text(json.dumps(cfg, indent=2, ensure_ascii=False), encoding="utf-8")
-    except Exception:
-        pass
+        if k not in cfg:
+            cfg[k] = v
+            migrated = True
 
-    return cfg
+    # Guarda sólo si hubo migración
+    if migrated:
+        mtime = save_config(cfg)
+    return _cache_config(mtime, cfg)
 
 
 # ----------------------------
 # Estado persistente (recientes + favoritos)
 # ----------------------------
+# Cache del estado parseado: (mtime del archivo, dict). Se invalida si el archivo cambia
+# desde fuera; load_state() siempre entrega una copia para que el cache no se mute.
+_STATE_CACHE: tuple[float, dict] | None = None
+
+
 def state_path() -> Path:
-    return Path(__file__).resolve().parent / STATE_FILE
+    return _SCRIPT_DIR / STATE_FILE
 
 
 def load_state() -> dict:
+    global _STATE_CACHE
     p = state_path()
-    if not p.exists():
+    try:
+        mtime = p.stat().st_mtime
+    except OSError:
+        _STATE_CACHE = None
         return {"recent": [], "favorites": []}
+
+    if _STATE_CACHE is not None and _STATE_CACHE[0] == mtime:
+        return copy.deepcopy(_STATE_CACHE[1])
+
     try:
         data = json.loads(p.read_text(encoding="utf-8"))
         if not isinstance(data, dict):
             return {"recent": [], "favorites": []}
         data.setdefault("recent", [])
         data.setdefault("favorites", [])
+        _STATE_CACHE = (mtime, copy.deepcopy(data))
         return data
     except Exception:
         return {"recent": [], "favorites": []}
 
 
 def save_state(state: dict):
+    global _STATE_CACHE
+    mtime = write_json_atomic(state_path(), state)
+    # Con el mtime recién escrito, el próximo load_state() no necesita releer el archivo
+    _STATE_CACHE = (mtime, copy.deepcopy(state)) if mtime is not None else None
+
+
+def add_recent(cfg: dict, script_path: Path, state: dict | None = None):
+    if state is None:
+        state = load_state()
+    p = _canon(str(script_path))
+    # Mover al frente en una sola pasada; maxlen recorta sin copias extra.
+    # Se toma sólo la cabeza de la lista (si recent_limit bajó, deque conservaría la cola).
+    limit = int(cfg.get("recent_limit", 15))
+    recent = deque(itertools.islice(state.get("recent", []), limit), maxlen=limit)
     try:
-        state_path().write_text(json.dumps(state, indent=2, ensure_ascii=False), encoding="utf-8")
-    except Exception:
+        recent.remove(p)
+    except ValueError:
         pass
-
-
-def add_recent(cfg: dict, script_path: Path):
-    state = load_state()
-    p = str(script_path.resolve())
-    recent = [x for x in state.get("recent", []) if x != p]
-    recent.insert(0, p)
-    state["recent"] = recent[: int(cfg.get("recent_limit", 15))]
+    recent.appendleft(p)
+    state["recent"] = list(recent)
     save_state(state)
 
 
-def toggle_favorite(script_path: Path) -> bool:
-    state = load_state()
-    p = str(script_path.resolve())
+def toggle_favorite(script_path: Path, state: dict | None = None) -> tuple[bool, dict]:
+    """
+    Alterna el favorito y devuelve (nuevo valor, estado actualizado), para que el
+    llamador reutilice el estado sin volver a parsear el archivo.
+    """
+    if state is None:
+        state = load_state()
+    p = _canon(str(script_path))
     favs = state.get("favorites", [])
     if p in favs:
         favs = [x for x in favs if x != p]
         state["favorites"] = favs
         save_state(state)
-        return False
+        return False, state
     else:
         favs.append(p)
         state["favorites"] = favs
         save_state(state)
-        return True
+        return True, state
 
 
-def is_favorite(script_path: Path) -> bool:
-    state = load_state()
-    return str(script_path.resolve()) in set(state.get("favorites", []))
+def get_favorites_set(state: dict | None = None) -> set[str]:
+    """
+    Lee el estado una sola vez y devuelve los favoritos como set (para consultas O(1)).
+    """
+    if state is None:
+        state = load_state()
+    return set(state.get("favorites", []))
+
+
+def is_favorite(script_path: Path, favs: set[str] | None = None, state: dict | None = None) -> bool:
+    if favs is None:
+        favs = get_favorites_set(state)
+    return _canon(str(script_path)) in favs
 
 
 # ----------------------------
 # Logging simple (append)
 # ----------------------------
+# Archivo de log abierto durante toda la sesión: (ruta, handle)
+_LOG_FH: tuple[Path, TextIO] | None = None
+
+
+def _close_log():
+    global _LOG_FH
+    if _LOG_FH is not None:
+        try:
+            _LOG_FH[1].close()
+        except Exception:
+            pass
+        _LOG_FH = None
+
+
 def log_event(cfg: dict, message: str):
+    global _LOG_FH
     try:
-        log_path = (Path(__file__).resolve().parent / cfg.get("log_file", "dashboard.log")).resolve()
-        line = f"[{now_str()}] {message}\n"
-        with log_path.open("a", encoding="utf-8", errors="replace") as f:
-            f.write(line)
+        log_path = (_SCRIPT_DIR / cfg.get("log_file", "dashboard.log")).resolve()
+        # Se abre una sola vez (o de nuevo si log_file cambió en la config).
+        # buffering=1: cada línea se vuelca al disco al escribirse.
+        if _LOG_FH is None or _LOG_FH[0] != log_path:
+            _close_log()
+            _LOG_FH = (log_path, log_path.open("a", encoding="utf-8", errors="replace", buffering=1))
+        _LOG_FH[1].write(f"[{now_str()}] {message}\n")
     except Exception:
         pass
 
 
+atexit.register(_close_log)
+
+
 # ----------------------------
 # Mostrar código (preview)
 # ----------------------------
@@ -187,24 +365,26 @@ def show_code_preview(cfg: dict, script_path: Path):
     print("-" * 60)
 
     try:
-        text = safe_read_text(script_path)
-        lines = text.splitlines()
         limit = int(cfg.get("code_preview_lines", 200))
 
-        if len(lines) <= limit:
-            print(text)
-        else:
-            start = 0
-            page = 60
-            while start < len(lines):
-                chunk = lines[start:start + page]
-                print("\n".join(chunk))
-                start += page
-                if start >= len(lines):
-                    break
-                resp = input("\n(Enter para seguir / 'q' para salir) > ").strip().lower()
-                if resp == "q":
-                    break
+        # Se lee por tramos desde el mismo archivo: nunca se carga completo en memoria
+        with safe_open_text(script_path) as f:
+            head = list(itertools.islice(f, limit + 1))
+
+            if len(head) <= limit:
+                sys.stdout.write("".join(head))
+            else:
+                page = 60
+                lines = itertools.chain(head, f)
+                chunk = list(itertools.islice(lines, page))
+                while chunk:
+                    sys.stdout.write("".join(chunk))
+                    chunk = list(itertools.islice(lines, page))
+                    if not chunk:
+                        break
+                    resp = input("\n(Enter para seguir / 'q' para salir) > ").strip().lower()
+                    if resp == "q":
+                        break
 
         print("\n" + "-" * 60)
     except FileNotFoundError:
@@ -218,6 +398,38 @@ def show_code_preview(cfg: dict, script_path: Path):
 # ----------------------------
 # Ejecutar script
 # ----------------------------
+def _run_inproc(script_path: Path, args: list[str]) -> int:
+    """
+    Ejecuta el script dentro de este intérprete (sin arrancar otro proceso), imitando
+    argv, sys.path y cwd que tendría como proceso aparte. Devuelve el código de salida.
+    """
+    import runpy
+    import traceback
+
+    old_argv, old_path, old_cwd = sys.argv, sys.path[:], os.getcwd()
+    sys.argv = [str(script_path), *args]
+    sys.path.insert(0, str(script_path.parent))
+    os.chdir(script_path.parent)
+    try:
+        runpy.run_path(str(script_path), run_name="__main__")
+        return 0
+    except SystemExit as e:
+        if e.code is None:
+            return 0
+        if isinstance(e.code, int):
+            return e.code
+        print(e.code, file=sys.stderr)
+        return 1
+    except Exception:
+        traceback.print_exc()
+        return 1
+    finally:
+        sys.stdout.flush()
+        sys.argv = old_argv
+        sys.path[:] = old_path
+        os.chdir(old_cwd)
+
+
 def run_script(cfg: dict, script_path: Path):
     if cfg.get("confirm_before_run", True):
         ans = input(f"¿Ejecutar '{script_path.name}'? (s/n) > ").strip().lower()
@@ -231,7 +443,7 @@ def run_script(cfg: dict, script_path: Path):
         raw = input("Argumentos (opcional, Enter para ninguno) > ").strip()
         if raw:
             try:
-                args = shlex.split(raw)
+                args = _fast_split(raw)
             except Exception:
                 # fallback básico
                 args = raw.split()
@@ -247,10 +459,15 @@ def run_script(cfg: dict, script_path: Path):
     add_recent(cfg, script_path)
 
     try:
-        cmd = [sys.executable, str(script_path), *args]
-        completed = subprocess.run(cmd, cwd=str(script_path.parent))
+        if cfg.get("inproc_run", False):
+            returncode = _run_inproc(script_path, args)
+        else:
+            # Import diferido: no se paga al arrancar si nunca se ejecuta un script
+            import subprocess
+            cmd = [sys.executable, str(script_path), *args]
+            returncode = subprocess.run(cmd, cwd=str(script_path.parent)).returncode
         print("\n" + "-" * 60)
-        print(f"Finalizó con código: {completed.returncode}")
+        print(f"Finalizó con código: {returncode}")
     except Exception as e:
         print(f"Error al ejecutar: {e}")
 
@@ -261,6 +478,8 @@ def run_script(cfg: dict, script_path: Path):
 # Abrir en editor
 # ----------------------------
 def open_in_editor(cfg: dict, script_path: Path):
+    import subprocess
+
     editor = (cfg.get("preferred_editor") or "").strip()
     log_event(cfg, f"OPEN_EDITOR {script_path}")
 
@@ -272,7 +491,7 @@ def open_in_editor(cfg: dict, script_path: Path):
                 subprocess.Popen(["xdg-open", str(script_path)])
             return
 
-        parts = shlex.split(editor)
+        parts = _fast_split(editor)
         subprocess.Popen([*parts, str(script_path)])
     except Exception as e:
         print(f"No se pudo abrir el editor: {e}")
@@ -284,70 +503,325 @@ def open_in_editor(cfg: dict, script_path: Path):
 # ----------------------------
 def list_subfolders(cfg: dict, unit_path: Path) -> list[Path]:
     show_hidden = bool(cfg.get("show_hidden_folders", False))
-    folders = []
     try:
-        for p in unit_path.iterdir():
-            if p.is_dir():
-                if not show_hidden and p.name.startswith("."):
-                    continue
-                folders.append(p)
-    except (FileNotFoundError, PermissionError):
+        # DirEntry trae el tipo desde readdir: no hace falta un stat por carpeta
+        with os.scandir(unit_path) as it:
+            folders = [
+                Path(e.path) for e in it
+                if (show_hidden or not e.name.startswith(".")) and e.is_dir()
+            ]
+    except (FileNotFoundError, NotADirectoryError, PermissionError):
         return []
-    return sorted(folders, key=lambda x: x.name.lower())
+    folders.sort(key=lambda x: x.name.lower())
+    return folders
 
 
 def list_scripts(folder: Path) -> list[Path]:
     try:
-        scripts = [p for p in folder.iterdir() if is_python_file(p)]
-    except (FileNotFoundError, PermissionError):
+        with os.scandir(folder) as it:
+            scripts = [
+                Path(e.path) for e in it
+                if e.name.lower().endswith(".py") and not e.name.startswith("__") and e.is_file()
+            ]
+    except (FileNotFoundError, NotADirectoryError, PermissionError):
         return []
-    return sorted(scripts, key=lambda x: x.name.lower())
+    scripts.sort(key=lambda x: x.name.lower())
+    return scripts
+
+
+def _mtime_ns(path: Path) -> int:
+    try:
+        return path.stat().st_mtime_ns
+    except OSError:
+        return -1
+
+
+@functools.lru_cache(maxsize=256)
+def _cached_list_subfolders(unit_str: str, mtime_ns: int, show_hidden: bool) -> tuple[Path, ...]:
+    """
+    list_subfolders memoizado por mtime de la carpeta: crear, borrar o renombrar una
+    subcarpeta cambia el mtime, así que los redibujos sin cambios no vuelven a listar.
+    """
+    return tuple(list_subfolders({"show_hidden_folders": show_hidden}, Path(unit_str)))
+
+
+@functools.lru_cache(maxsize=256)
+def _cached_list_scripts(folder_str: str, mtime_ns: int) -> tuple[Path, ...]:
+    """
+    list_scripts memoizado por mtime de la carpeta (igual que _cached_list_subfolders).
+    """
+    return tuple(list_scripts(Path(folder_str)))
+
+
+def _glob_to_regex(pattern: str) -> str:
+    """
+    Traduce un glob estilo .gitignore: "*" y "?" no cruzan "/", "**" sí, y "\\x"
+    es el carácter x literal.
+    """
+    out = []
+    i = 0
+    while i < len(pattern):
+        if pattern[i] == "\\" and i + 1 < len(pattern):
+            out.append(re.escape(pattern[i + 1]))
+            i += 2
+        elif pattern.startswith("**/", i):
+            out.append("(?:.*/)?")
+            i += 3
+        elif pattern.startswith("**", i):
+            out.append(".*")
+            i += 2
+        elif pattern[i] == "*":
+            out.append("[^/]*")
+            i += 1
+        elif pattern[i] == "?":
+            out.append("[^/]")
+            i += 1
+        else:
+            out.append(re.escape(pattern[i]))
+            i += 1
+    return "".join(out)
+
+
+def _simple_ignore_matcher(lines: list[str]) -> Callable[[str], bool]:
+    """
+    Matcher mínimo de .gitignore para cuando pathspec no está instalado: comentarios,
+    negación (!), patrones de carpeta (dir/), anclados (/x o a/b), comodines * ? ** y
+    escapes con "\\" ("\\#", "\\!", espacios finales "\\ "). No soporta clases [abc].
+    """
+    rules: list[tuple[re.Pattern[str], bool]] = []
+    for raw in lines:
+        # Como git: se quitan los espacios finales salvo el último si va escapado
+        line = raw.rstrip("\r\n")
+        stripped = line.rstrip(" ")
+        backslashes = len(stripped) - len(stripped.rstrip("\\"))
+        if len(stripped) < len(line) and backslashes % 2 == 1:
+            stripped += " "
+        line = stripped
+        if not line or line.startswith("#"):
+            continue
+        negate = line.startswith("!")
+        if negate:
+            line = line[1:]
+        dir_only = line.endswith("/")
+        line = line.rstrip("/")
+        if not line:
+            continue
+        anchored = "/" in line
+        body = _glob_to_regex(line.lstrip("/"))
+        prefix = "" if anchored else "(?:.*/)?"
+        suffix = "/" if dir_only else "/?"
+        rules.append((re.compile(prefix + body + suffix + r"\Z"), negate))
+
+    def match(rel: str) -> bool:
+        ignored = False
+        for rx, negate in rules:
+            if rx.match(rel):
+                ignored = not negate
+        return ignored
+
+    return match
+
+
+@functools.lru_cache(maxsize=32)
+def _load_ignore_spec(unit_str: str, mtimes: tuple[int, ...]) -> Callable[[str], bool] | None:
+    """
+    Lee IGNORE_FILES de la unidad y devuelve una función rel_path -> ignorado (las carpetas
+    se consultan con "/" final). Memoizado por los mtimes de esos archivos.
+    Usa pathspec si está instalado (opcional); si no, un matcher propio más simple.
+    """
+    lines: list[str] = []
+    for name in IGNORE_FILES:
+        try:
+            lines.extend((Path(unit_str) / name).read_text(encoding="utf-8", errors="replace").splitlines())
+        except OSError:
+            continue
+    if not any(line.strip() and not line.lstrip().startswith("#") for line in lines):
+        return None
+
+    try:
+        import pathspec
+    except ImportError:
+        return _simple_ignore_matcher(lines)
+    # GitIgnoreSpec (pathspec >= 0.10) sigue la semántica de git; "gitwildmatch" está obsoleto
+    if hasattr(pathspec, "GitIgnoreSpec"):
+        return pathspec.GitIgnoreSpec.from_lines(lines).match_file
+    return pathspec.PathSpec.from_lines("gitwildmatch", lines).match_file
+
+
+def _walk_py(
+    root: Path,
+    ignore: set[str],
+    show_hidden: bool = False,
+    ignored: Callable[[str], bool] | None = None,
+    max_depth: int = 20
+) -> Iterator[Path]:
+    """
+    Recorre root con os.scandir y poda las carpetas ignoradas (por nombre, o con
+    ignored sobre la ruta relativa a root) antes de entrar en ellas.
+    Usa la info cacheada de cada DirEntry (sin stat extra por archivo).
+    """
+    pending = deque([(root, "", 0)])
+    while pending:
+        folder, rel_prefix, depth = pending.popleft()
+        try:
+            with os.scandir(folder) as it:
+                for entry in it:
+                    name = entry.name
+                    rel = rel_prefix + name
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            if name in ignore or (not show_hidden and name.startswith(".")):
+                                continue
+                            if ignored is not None and ignored(rel + "/"):
+                                continue
+                            if depth < max_depth:
+                                pending.append((Path(entry.path), rel + "/", depth + 1))
+                        elif name.endswith(".py") and not name.startswith("__") and entry.is_file():
+                            if ignored is not None and ignored(rel):
+                                continue
+                            yield Path(entry.path)
+                    except OSError:
+                        continue
+        except OSError:
+            continue
+
+
+# ----------------------------
+# Índice de búsqueda (persistente entre ejecuciones)
+# ----------------------------
+# clave de unidad -> (huella de mtimes, [(nombre en minúsculas, ruta)]) ordenado por nombre
+_search_index_cache: dict[str, tuple[float, list[tuple[str, str]]]] = {}
+_search_index_loaded = False
+
+
+def index_path() -> Path:
+    return _SCRIPT_DIR / INDEX_FILE
+
+
+def _load_search_index():
+    global _search_index_loaded
+    if _search_index_loaded:
+        return
+    _search_index_loaded = True
+    try:
+        data = json.loads(index_path().read_text(encoding="utf-8"))
+        for key, (fingerprint, entries) in data.items():
+            _search_index_cache[key] = (float(fingerprint), [(n, p) for n, p in entries])
+    except Exception:
+        pass
+
+
+def _save_search_index():
+    write_json_atomic(index_path(), {k: [fp, entries] for k, (fp, entries) in _search_index_cache.items()})
+
+
+def clear_search_index():
+    """
+    Descarta el índice (memoria y disco): la próxima búsqueda vuelve a recorrer las carpetas.
+    """
+    global _search_index_loaded
+    _search_index_cache.clear()
+    _search_index_loaded = True
+    try:
+        index_path().unlink()
+    except OSError:
+        pass
+
+
+def _unit_fingerprint(unit_path: Path) -> float:
+    """
+    Huella barata: mtime de la unidad y de sus carpetas de primer nivel.
+    No detecta cambios más profundos; para eso está clear_search_index().
+    """
+    fingerprint = unit_path.stat().st_mtime
+    with os.scandir(unit_path) as it:
+        for entry in it:
+            if entry.is_dir(follow_symlinks=False):
+                fingerprint = max(fingerprint, entry.stat(follow_symlinks=False).st_mtime)
+    return fingerprint
 
 
 def search_scripts(cfg: dict, unit_path: Path, query: str) -> list[Path]:
     """
     Busca recursivamente scripts .py por nombre dentro de la unidad, ignorando carpetas ruidosas.
+    Reutiliza el índice de la unidad mientras su huella de mtimes no cambie.
     """
     query = query.lower().strip()
     ignore_dirs = set(cfg.get("ignore_dirs", []))
+    show_hidden = bool(cfg.get("show_hidden_folders", False))
+    ignore_mtimes = tuple(_mtime_ns(unit_path / name) for name in IGNORE_FILES)
+    # Las opciones de filtrado (y los archivos de exclusión) forman parte de la clave:
+    # cambiarlas invalida el índice
+    key = f"{unit_path}|{int(show_hidden)}|{','.join(sorted(ignore_dirs))}|{ignore_mtimes}"
 
-    hits = []
     try:
-        for p in unit_path.rglob("*.py"):
-            if not p.is_file():
-                continue
-            if p.name.startswith("__"):
-                continue
-            # ignora carpetas por nombre
-            if any(part in ignore_dirs for part in p.parts):
-                continue
-            if query in p.name.lower():
-                hits.append(p)
-    except Exception:
+        fingerprint = _unit_fingerprint(unit_path)
+    except OSError:
         return []
 
-    return sorted(hits, key=lambda x: x.name.lower())
+    _load_search_index()
+    cached = _search_index_cache.get(key)
+    if cached is not None and cached[0] == fingerprint:
+        entries = cached[1]
+    else:
+        try:
+            entries = sorted(
+                (
+                    (p.name.lower(), str(p))
+                    for p in _walk_py(unit_path, ignore_dirs, show_hidden, _load_ignore_spec(str(unit_path), ignore_mtimes))
+                ),
+                key=lambda e: e[0]
+            )
+        except Exception:
+            return []
+        # Descarta entradas viejas de la misma unidad (otras opciones o exclusiones)
+        for old in [k for k in _search_index_cache if k.startswith(f"{unit_path}|")]:
+            del _search_index_cache[old]
+        _search_index_cache[key] = (fingerprint, entries)
+        _save_search_index()
+
+    return [Path(p) for name, p in entries if query in name]
 
 
 # ----------------------------
 # Acciones rápidas: recientes y favoritos
 # ----------------------------
-def get_recent_scripts(cfg: dict) -> list[Path]:
-    state = load_state()
+@functools.lru_cache(maxsize=512)
+def _validate_script(path_str: str, folder_mtime_ns: int) -> Path | None:
+    """
+    Comprueba que la ruta guardada siga siendo un .py válido. El mtime de la carpeta
+    contenedora forma parte de la clave: borrar o recrear el script lo cambia, así que
+    el resultado memoizado nunca queda desactualizado.
+    """
+    pp = Path(path_str)
+    if pp.exists() and is_python_file(pp):
+        return pp
+    return None
+
+
+def _check_script(path_str: str) -> Path | None:
+    # Un solo stat (el de la carpeta) en lugar de exists() + is_file() por script
+    return _validate_script(path_str, _mtime_ns(Path(path_str).parent))
+
+
+def get_recent_scripts(cfg: dict, state: dict | None = None) -> list[Path]:
+    if state is None:
+        state = load_state()
     out = []
     for p in state.get("recent", []):
-        pp = Path(p)
-        if pp.exists() and is_python_file(pp):
+        pp = _check_script(p)
+        if pp is not None:
             out.append(pp)
     return out[: int(cfg.get("recent_limit", 15))]
 
 
-def get_favorite_scripts() -> list[Path]:
-    state = load_state()
+def get_favorite_scripts(state: dict | None = None) -> list[Path]:
+    if state is None:
+        state = load_state()
     out = []
     for p in state.get("favorites", []):
-        pp = Path(p)
-        if pp.exists() and is_python_file(pp):
+        pp = _check_script(p)
+        if pp is not None:
             out.append(pp)
     return sorted(out, key=lambda x: x.name.lower())
 
@@ -358,20 +832,24 @@ def get_favorite_scripts() -> list[Path]:
 def main_menu(cfg: dict):
     base_dir = Path(cfg["base_dir"])
     units: dict[str, str] = cfg.get("units", {})
+    units_sorted: tuple[str, ...] = cfg["_units_sorted"]
+    app_name = cfg.get("app_name", "Dashboard")
+    fav_enabled = cfg.get("favorites_enabled", True)
 
     while True:
         clear_screen()
-        print(f"=== {cfg.get('app_name', 'Dashboard')} ===")
+        print(f"=== {app_name} ===")
         print(f"Base: {base_dir}")
         print("\nUnidades:")
-        for k in sorted(units.keys()):
+        for k in units_sorted:
             print(f"  {k}) {units[k]}")
 
         print("\nAcciones:")
         print("  r) Recientes")
-        if cfg.get("favorites_enabled", True):
+        if fav_enabled:
             print("  f) Favoritos")
         print("  s) Buscar script por nombre (en una unidad)")
+        print("  i) Reconstruir índice de búsqueda")
         print("  c) Abrir/editar configuración (dashboard_config.json)")
         print("  0) Salir")
 
@@ -382,9 +860,19 @@ def main_menu(cfg: dict):
             return
 
         if choice == "c":
-            config_path = Path(__file__).resolve().parent / CONFIG_FILE
+            config_path = _SCRIPT_DIR / CONFIG_FILE
             open_in_editor(cfg, config_path)
             cfg.update(load_or_create_config())
+            units = cfg.get("units", {})
+            units_sorted = cfg["_units_sorted"]
+            app_name = cfg.get("app_name", "Dashboard")
+            fav_enabled = cfg.get("favorites_enabled", True)
+            continue
+
+        if choice == "i":
+            clear_search_index()
+            print("Índice de búsqueda descartado; se reconstruirá en la próxima búsqueda.")
+            pause()
             continue
 
         if choice == "r":
@@ -396,7 +884,7 @@ def main_menu(cfg: dict):
             scripts_actions_menu(cfg, recents, title="Recientes")
             continue
 
-        if choice == "f" and cfg.get("favorites_enabled", True):
+        if choice == "f" and fav_enabled:
             favs = get_favorite_scripts()
             if not favs:
                 print("No hay favoritos aún. Marca uno con ⭐ desde el menú del script.")
@@ -432,12 +920,16 @@ def main_menu(cfg: dict):
 
 
 def unit_menu(cfg: dict, unit_path: Path, unit_name: str):
+    app_name = cfg.get("app_name", "Dashboard")
+
     while True:
         clear_screen()
-        print(f"=== {cfg.get('app_name', 'Dashboard')} > {unit_name} ===")
+        print(f"=== {app_name} > {unit_name} ===")
         print(f"Ruta: {unit_path}\n")
 
-        folders = list_subfolders(cfg, unit_path)
+        folders = _cached_list_subfolders(
+            str(unit_path), _mtime_ns(unit_path), bool(cfg.get("show_hidden_folders", False))
+        )
         if not folders:
             print("No hay subcarpetas (o la ruta no existe).")
             print("\nOpciones:")
@@ -480,13 +972,14 @@ def unit_menu(cfg: dict, unit_path: Path, unit_name: str):
 
 def folder_menu(cfg: dict, folder: Path, unit_name: str):
     base_dir = Path(cfg["base_dir"])
+    app_name = cfg.get("app_name", "Dashboard")
 
     while True:
         clear_screen()
-        print(f"=== {cfg.get('app_name', 'Dashboard')} > {unit_name} > {folder.name} ===")
+        print(f"=== {app_name} > {unit_name} > {folder.name} ===")
         print(f"Ruta: {folder}\n")
 
-        scripts = list_scripts(folder)
+        scripts = _cached_list_scripts(str(folder), _mtime_ns(folder))
         if not scripts:
             print("No hay scripts .py en esta carpeta.")
             print("\nOpciones:")
@@ -500,8 +993,9 @@ def folder_menu(cfg: dict, folder: Path, unit_name: str):
                 continue
             continue
 
+        favs = get_favorites_set()
         for i, s in enumerate(scripts, start=1):
-            star = "⭐ " if is_favorite(s) else "   "
+            star = "⭐ " if _canon(str(s)) in favs else "   "
             print(f"  {i}) {star}{s.name}")
 
         print("\nAcciones:")
@@ -530,6 +1024,10 @@ def folder_menu(cfg: dict, folder: Path, unit_name: str):
 
 def script_actions_menu(cfg: dict, script_path: Path, base_dir: Path | None = None):
     base_dir = base_dir or Path(cfg["base_dir"])
+    fav_enabled = cfg.get("favorites_enabled", True)
+    confirm_before_run = cfg.get("confirm_before_run", True)
+    # Estado compartido entre redibujos; None = releer (otra acción pudo modificarlo)
+    state: dict | None = None
 
     while True:
         clear_screen()
@@ -537,13 +1035,14 @@ def script_actions_menu(cfg: dict, script_path: Path, base_dir: Path | None = No
         print(f"Ruta: {relpath_str(script_path, base_dir)}")
         print(f"Absoluta: {script_path}\n")
 
-        fav_enabled = cfg.get("favorites_enabled", True)
-        fav = is_favorite(script_path) if fav_enabled else False
+        if state is None:
+            state = load_state()
+        fav = is_favorite(script_path, state=state) if fav_enabled else False
 
         print("Acciones:")
         print("  1) Ver código")
         print("  2) Ejecutar")
-        print("  3) Ejecutar (sin confirmar)" if cfg.get("confirm_before_run", True) else "  3) Ejecutar (confirmar)")
+        print("  3) Ejecutar (sin confirmar)" if confirm_before_run else "  3) Ejecutar (confirmar)")
         print("  4) Abrir en editor")
         print("  5) Abrir carpeta contenedora")
         if fav_enabled:
@@ -560,34 +1059,41 @@ def script_actions_menu(cfg: dict, script_path: Path, base_dir: Path | None = No
             run_script(cfg, script_path)
         elif choice == "3":
             # Ejecutar invirtiendo temporalmente confirm_before_run
-            old = cfg.get("confirm_before_run", True)
-            cfg["confirm_before_run"] = not old
+            cfg["confirm_before_run"] = not confirm_before_run
             try:
                 run_script(cfg, script_path)
             finally:
-                cfg["confirm_before_run"] = old
+                cfg["confirm_before_run"] = confirm_before_run
         elif choice == "4":
             open_in_editor(cfg, script_path)
         elif choice == "5":
             open_folder(script_path.parent)
         elif choice == "6" and fav_enabled:
-            new_state = toggle_favorite(script_path)
-            print("✅ Marcado como favorito." if new_state else "✅ Quitado de favoritos.")
+            new_fav, state = toggle_favorite(script_path, state)
+            print("✅ Marcado como favorito." if new_fav else "✅ Quitado de favoritos.")
             pause()
+            continue
         else:
             print("Opción inválida.")
             pause()
 
+        # Las demás acciones pueden modificar el estado (ej: run_script -> add_recent)
+        state = None
+
 
 def scripts_actions_menu(cfg: dict, scripts: list[Path], title: str = "Scripts"):
     base_dir = Path(cfg["base_dir"])
+    # La lista no cambia mientras el menú está abierto: rutas y etiquetas se calculan una vez
+    keys = [_canon(str(s)) for s in scripts]
+    labels = [f"{s.name}   ({relpath_str(s.parent, base_dir)})" for s in scripts]
 
     while True:
         clear_screen()
         print(f"=== {title} ===\n")
-        for i, s in enumerate(scripts, start=1):
-            star = "⭐ " if is_favorite(s) else "   "
-            print(f"  {i}) {star}{s.name}   ({relpath_str(s.parent, base_dir)})")
+        favs = get_favorites_set()
+        for i, (key, label) in enumerate(zip(keys, labels), start=1):
+            star = "⭐ " if key in favs else "   "
+            print(f"  {i}) {star}{label}")
 
         print("\nOpciones:")
         print("  b) Volver")
@@ -609,6 +1115,8 @@ def scripts_actions_menu(cfg: dict, scripts: list[Path], title: str = "Scripts")
 
 
 def open_folder(path: Path):
+    import subprocess
+
     try:
         if os.name == "nt":
             os.startfile(str(path))  # type: ignore[attr-defined]
@@ -629,14 +1137,8 @@ def main():
     # Asegura base_dir válido
     base_dir = Path(cfg["base_dir"])
     if not base_dir.exists():
-        cfg["base_dir"] = str(Path(__file__).resolve().parent)
-        try:
-            (Path(__file__).resolve().parent / CONFIG_FILE).write_text(
-                json.dumps(cfg, indent=2, ensure_ascii=False),
-                encoding="utf-8"
-            )
-        except Exception:
-            pass
+        cfg["base_dir"] = str(_SCRIPT_DIR)
+        _cache_config(save_config(cfg), cfg)
 
     main_menu(cfg)
 